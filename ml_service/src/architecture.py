@@ -0,0 +1,28 @@
+"""
+Model architecture shared by the inference service and offline tools
+"""
+
+import torch.nn as nn
+from torchvision import models
+
+
+def build_model(num_classes: int) -> nn.Module:
+    """
+    Build EfficientNet-B0 model architecture
+
+    Args:
+        num_classes: Number of output classes
+
+    Returns:
+        Model instance
+    """
+    model = models.efficientnet_b0(weights=None)
+
+    # Replace classifier to match training configuration
+    num_features = model.classifier[1].in_features
+    model.classifier = nn.Sequential(
+        nn.Dropout(p=0.2, inplace=True),
+        nn.Linear(num_features, num_classes)
+    )
+
+    return model
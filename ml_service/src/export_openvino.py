@@ -0,0 +1,77 @@
+"""
+Export the succulent classifier to OpenVINO IR with INT8 quantization
+"""
+
+import os
+import torch
+import nncf
+import openvino as ov
+
+from preprocessing import ImagePreprocessor
+from quantize import load_float_model, get_calibration_images
+
+
+# Configuration
+class Config:
+    DATA_DIR = "../data/raw"
+    MODEL_PATH = "../models/succulent_classifier_best.pth"
+    ONNX_PATH = "../models/succulent_classifier.onnx"
+    OUTPUT_PATH = "../models/succulent_int8.xml"
+
+    # Calibration parameters
+    NUM_CALIBRATION_IMAGES = 100
+    IMG_SIZE = 224
+    ONNX_OPSET = 17
+
+
+def export_onnx(model, save_path):
+    """Export model to ONNX with a dynamic batch dimension"""
+    dummy = torch.zeros(1, 3, Config.IMG_SIZE, Config.IMG_SIZE)
+    torch.onnx.export(
+        model,
+        dummy,
+        save_path,
+        opset_version=Config.ONNX_OPSET,
+        input_names=["input"],
+        output_names=["logits"],
+        dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}}
+    )
+    print(f"ONNX model saved to {save_path}")
+
+
+def quantize_openvino(onnx_path, image_paths):
+    """Quantize the ONNX model to INT8 with NNCF"""
+    preprocessor = ImagePreprocessor(img_size=Config.IMG_SIZE)
+
+    def transform_fn(image_path):
+        return preprocessor.preprocess_from_path(str(image_path)).numpy()
+
+    ov_model = ov.Core().read_model(onnx_path)
+    calibration_dataset = nncf.Dataset(image_paths, transform_fn)
+    quantized = nncf.quantize(ov_model, calibration_dataset, subset_size=len(image_paths))
+
+    print(f"Calibrated on {len(image_paths)} images")
+    return quantized
+
+
+def main():
+    """Main export function"""
+    model, _ = load_float_model(Config.MODEL_PATH)
+
+    os.makedirs(os.path.dirname(Config.ONNX_PATH), exist_ok=True)
+    export_onnx(model, Config.ONNX_PATH)
+
+    image_paths = get_calibration_images(Config.DATA_DIR, Config.NUM_CALIBRATION_IMAGES)
+    if not image_paths:
+        raise RuntimeError(f"No calibration images found in {Config.DATA_DIR}")
+
+    print("\nQuantizing model...")
+    quantized = quantize_openvino(Config.ONNX_PATH, image_paths)
+    ov.save_model(quantized, Config.OUTPUT_PATH)
+    print(f"OpenVINO INT8 model saved to {Config.OUTPUT_PATH}")
+
+    print("\nExport completed!")
+
+
+if __name__ == "__main__":
+    main()
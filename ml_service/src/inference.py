@@ -4,17 +4,32 @@ FastAPI inference service for succulent plant classification
 
 import os
 import json
+import asyncio
 import torch
 import torch.nn as nn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict
-from torchvision import models
+from typing import List, Dict, Optional, Tuple
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from architecture import build_model
 from preprocessing import ImagePreprocessor
+from labels import class_to_label
+
+try:
+    import intel_extension_for_pytorch as ipex
+except ImportError:
+    ipex = None
+
+try:
+    import openvino as ov
+except ImportError:
+    ov = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,8 +41,23 @@ class Config:
     MODEL_PATH = os.getenv("MODEL_PATH", "../models/succulent_classifier_best.pth")
     LABELS_PATH = os.getenv("LABELS_PATH", "../labels.json")
     TOP_K = int(os.getenv("TOP_K", "3"))
+    MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "32"))
+    PREPROCESS_WORKERS = int(os.getenv("PREPROCESS_WORKERS", "4"))
+    PREPROCESS_CACHE_SIZE = int(os.getenv("PREPROCESS_CACHE_SIZE", "0"))
+    DYNAMIC_BATCHING = os.getenv("DYNAMIC_BATCHING", "true").lower() == "true"
+    DYNAMIC_BATCH_SIZE = int(os.getenv("DYNAMIC_BATCH_SIZE", "16"))
+    BATCH_WAIT_MS = float(os.getenv("BATCH_WAIT_MS", "5"))
     IMG_SIZE = 224
-    DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    # Quantized TorchScript (.pt) and OpenVINO (.xml) models run on CPU only
+    QUANTIZED = MODEL_PATH.endswith((".pt", ".xml"))
+    OPENVINO = MODEL_PATH.endswith(".xml")
+    COMPILE_MODEL = os.getenv("COMPILE_MODEL", "true").lower() == "true"
+    COMPILE_MODE = os.getenv("COMPILE_MODE", "reduce-overhead")
+    CPU_BF16 = os.getenv("CPU_BF16", "true").lower() == "true"
+    CUDA_FP16 = os.getenv("CUDA_FP16", "true").lower() == "true"
+    CUDA_GRAPHS = os.getenv("CUDA_GRAPHS", "true").lower() == "true"
+    WARMUP_ITERS = 3
+    DEVICE = torch.device("cuda" if torch.cuda.is_available() and not QUANTIZED else "cpu")
 
 
 # Request/Response models
@@ -44,13 +74,31 @@ class InferenceResponse(BaseModel):
     predictions: List[Prediction]
 
 
+class BatchInferenceRequest(BaseModel):
+    image_paths: List[str]
+
+
+class BatchInferenceResponse(BaseModel):
+    results: List[InferenceResponse]
+
+
 # Global variables for model and labels
 model = None
-labels_map = None
+labels_list = None
 preprocessor = None
+batcher = None
+autocast_dtype = None
+input_dtype = torch.float32
+
+# Image decoding and transforms release the GIL, so batches preprocess in parallel
+preprocess_executor = ThreadPoolExecutor(max_workers=Config.PREPROCESS_WORKERS)
+
+# All model calls, including startup warm-up, run on this one thread: compiled
+# CUDA graph trees are recorded per thread, and the compiled module isn't re-entrant
+inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
 
 
-def load_labels(labels_path: str) -> Dict[int, str]:
+def load_labels(labels_path: str) -> List[str]:
     """
     Load labels mapping from JSON file
 
@@ -58,7 +106,7 @@ def load_labels(labels_path: str) -> Dict[int, str]:
         labels_path: Path to labels.json file
 
     Returns:
-        Dictionary mapping class indices to labels
+        List of labels indexed by class index
     """
     try:
         with open(labels_path, 'r') as f:
@@ -66,8 +114,11 @@ def load_labels(labels_path: str) -> Dict[int, str]:
 
         # Convert string keys to integers
         labels_map = {int(k): v for k, v in labels_data.items()}
-        logger.info(f"Loaded {len(labels_map)} labels from {labels_path}")
-        return labels_map
+
+        # Class indices are contiguous, so a list avoids hashing on lookup
+        labels_list = [labels_map[i] for i in range(len(labels_map))]
+        logger.info(f"Loaded {len(labels_list)} labels from {labels_path}")
+        return labels_list
 
     except FileNotFoundError:
         logger.error(f"Labels file not found: {labels_path}")
@@ -80,58 +131,87 @@ def load_labels(labels_path: str) -> Dict[int, str]:
         raise
 
 
-def build_model(num_classes: int) -> nn.Module:
-    """
-    Build EfficientNet-B0 model architecture
+class OpenVINOModel:
+    """Adapts a compiled OpenVINO model to the PyTorch model call interface"""
 
-    Args:
-        num_classes: Number of output classes
+    def __init__(self, compiled_model):
+        """
+        Args:
+            compiled_model: Model compiled with openvino.compile_model
+        """
+        self.compiled_model = compiled_model
+        # The compiled model's implicit infer request is not thread-safe
+        self.lock = threading.Lock()
 
-    Returns:
-        Model instance
-    """
-    model = models.efficientnet_b0(weights=None)
+    def __call__(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Run inference on a CPU batch
 
-    # Replace classifier to match training configuration
-    num_features = model.classifier[1].in_features
-    model.classifier = nn.Sequential(
-        nn.Dropout(p=0.2, inplace=True),
-        nn.Linear(num_features, num_classes)
-    )
+        Args:
+            input_tensor: Input batch of shape (N, 3, H, W)
 
-    return model
+        Returns:
+            Model output logits
+        """
+        with self.lock:
+            outputs = self.compiled_model([input_tensor.contiguous().numpy()])[0]
+        return torch.from_numpy(outputs)
 
 
-def load_model(model_path: str, num_classes: int, device: torch.device) -> nn.Module:
+def load_model(model_path: str, device: torch.device) -> Tuple[nn.Module, Optional[List[str]]]:
     """
     Load trained model from checkpoint
 
+    Checkpoints ending in .pt are loaded as quantized TorchScript models
+    produced by quantize.py, and .xml files as OpenVINO IR models produced
+    by export_openvino.py.
+
     Args:
         model_path: Path to model checkpoint file
-        num_classes: Number of output classes
         device: Device to load model on
 
     Returns:
-        Loaded model in evaluation mode
+        Tuple of the loaded model in evaluation mode and the labels stored
+        with it, or None if the model file has no labels (OpenVINO models)
     """
     try:
-        # Build model architecture
-        model = build_model(num_classes)
+        if model_path.endswith(".pt"):
+            extra_files = {"classes.json": ""}
+            model = torch.jit.load(model_path, map_location=device, _extra_files=extra_files)
+            model.eval()
+            labels = None
+            if extra_files["classes.json"]:
+                classes = json.loads(extra_files["classes.json"])
+                labels = [class_to_label(c) for c in classes]
+            logger.info(f"Quantized model loaded successfully from {model_path}")
+            return model, labels
+
+        if model_path.endswith(".xml"):
+            if ov is None:
+                raise RuntimeError("openvino is required to load .xml models")
+            model = OpenVINOModel(ov.compile_model(model_path, "CPU"))
+            logger.info(f"OpenVINO model loaded successfully from {model_path}")
+            return model, None
 
         # Load checkpoint
         checkpoint = torch.load(model_path, map_location=device)
+        labels = [class_to_label(c) for c in checkpoint['classes']]
 
-        # Load model weights
+        # Build model architecture and load weights
+        model = build_model(len(labels))
         model.load_state_dict(checkpoint['model_state_dict'])
 
-        # Move to device and set to eval mode
-        model = model.to(device)
+        # Dropout is a no-op at inference; keep only the Linear so the head is one module
+        model.classifier = model.classifier[1]
+
+        # Move to device in channels-last format and set to eval mode
+        model = model.to(device, memory_format=torch.channels_last)
         model.eval()
 
         logger.info(f"Model loaded successfully from {model_path}")
         logger.info(f"Model validation accuracy: {checkpoint.get('val_acc', 'N/A')}")
 
-        return model
+        return model, labels
 
     except FileNotFoundError:
         logger.error(f"Model file not found: {model_path}")
@@ -141,6 +221,241 @@ def load_model(model_path: str, num_classes: int, device: torch.device) -> nn.Mo
         raise
 
 
+def autocast_context(cache_enabled: bool = True):
+    """
+    Autocast context matching the configured inference precision
+
+    Args:
+        cache_enabled: Cache weight casts inside the context; must be False
+            around CUDA graph capture, since cached casts are freed on exit
+
+    Returns:
+        torch.autocast context manager
+    """
+    return torch.autocast(
+        Config.DEVICE.type,
+        dtype=autocast_dtype,
+        enabled=autocast_dtype is not None,
+        cache_enabled=cache_enabled
+    )
+
+
+def prepare_input(input_tensor: torch.Tensor) -> torch.Tensor:
+    """Move a preprocessed batch to the model's device, dtype and memory format"""
+    # OpenVINO takes contiguous NCHW numpy arrays, so channels-last would only be undone
+    memory_format = torch.contiguous_format if Config.OPENVINO else torch.channels_last
+    return input_tensor.to(
+        Config.DEVICE,
+        dtype=input_dtype,
+        memory_format=memory_format,
+        non_blocking=True
+    )
+
+
+def optimize_for_cpu(model: nn.Module) -> nn.Module:
+    """
+    Apply CPU-specific optimizations
+
+    When Intel Extension for PyTorch is installed, runs ipex.optimize
+    for oneDNN/AMX kernels.
+
+    Args:
+        model: Model in evaluation mode on CPU
+
+    Returns:
+        Optimized model
+    """
+    if ipex is None:
+        return model
+
+    dtype = torch.bfloat16 if Config.CPU_BF16 else torch.float32
+    model = ipex.optimize(model, dtype=dtype, inplace=True)
+    logger.info(f"Model optimized with Intel Extension for PyTorch (dtype={dtype})")
+    return model
+
+
+def warmup_batch_sizes() -> List[int]:
+    """
+    Batch sizes the model is warmed up and graph-captured for
+
+    Powers of two up to the dynamic batch size (plus that size itself),
+    so batched /infer requests hit a pre-built graph instead of compiling
+    during live traffic.
+
+    Returns:
+        Sorted list of batch sizes, always starting with 1
+    """
+    max_batch = Config.DYNAMIC_BATCH_SIZE if Config.DYNAMIC_BATCHING else 1
+    sizes = {2 ** i for i in range(max_batch.bit_length()) if 2 ** i < max_batch}
+    return sorted(sizes | {max_batch, 1})
+
+
+class CUDAGraphRunner:
+    """Replays captured CUDA graphs for a fixed set of batch sizes"""
+
+    def __init__(self, model, device: torch.device, img_size: int, batch_sizes: List[int]):
+        """
+        Warm up the model on a side stream and capture one graph per batch size
+
+        Args:
+            model: Model in evaluation mode, already on the CUDA device
+            device: CUDA device to capture on
+            img_size: Input image size the graphs are captured for
+            batch_sizes: Batch sizes to capture graphs for
+        """
+        self.model = model
+        self.lock = threading.Lock()
+        self.batch_sizes = sorted(batch_sizes)
+        self.graphs = {}
+
+        for batch_size in self.batch_sizes:
+            static_input = prepare_input(torch.zeros(batch_size, 3, img_size, img_size))
+
+            # Warm-up must run on a side stream before capture
+            stream = torch.cuda.Stream(device=device)
+            stream.wait_stream(torch.cuda.current_stream(device))
+            with torch.cuda.stream(stream), torch.inference_mode(), autocast_context(cache_enabled=False):
+                for _ in range(Config.WARMUP_ITERS):
+                    model(static_input)
+            torch.cuda.current_stream(device).wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.inference_mode(), autocast_context(cache_enabled=False), torch.cuda.graph(graph):
+                static_output = model(static_input)
+
+            self.graphs[batch_size] = (graph, static_input, static_output)
+
+    def __call__(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Run the smallest captured graph that fits the batch
+
+        Batches are padded up to the captured size; inputs larger than the
+        largest captured graph, or of another image size, run on the model.
+
+        Args:
+            input_tensor: Input batch on the CUDA device
+
+        Returns:
+            Model output logits
+        """
+        num_images = input_tensor.shape[0]
+        batch_size = next((b for b in self.batch_sizes if b >= num_images), None)
+        if batch_size is None:
+            return self.model(input_tensor)
+
+        graph, static_input, static_output = self.graphs[batch_size]
+        if input_tensor.shape[1:] != static_input.shape[1:]:
+            return self.model(input_tensor)
+
+        with self.lock:
+            # Padding rows keep stale inputs; their outputs are discarded
+            static_input[:num_images].copy_(input_tensor, non_blocking=True)
+            graph.replay()
+            # Output buffer is overwritten on the next replay
+            return static_output[:num_images].clone()
+
+
+def capture_cuda_graph(model, device: torch.device):
+    """
+    Wrap model in a CUDAGraphRunner
+
+    Args:
+        model: Model in evaluation mode
+        device: Device the model lives on
+
+    Returns:
+        CUDAGraphRunner, or the original model if capture fails
+    """
+    try:
+        batch_sizes = warmup_batch_sizes()
+        runner = CUDAGraphRunner(model, device, Config.IMG_SIZE, batch_sizes)
+        logger.info(f"Captured CUDA graphs for batch sizes {batch_sizes}")
+        return runner
+
+    except Exception as e:
+        logger.warning(f"CUDA graph capture failed, using uncaptured model: {e}")
+        return model
+
+
+def compile_model(model: nn.Module, mode: str, backend: str = "inductor") -> nn.Module:
+    """
+    Compile model with torch.compile and warm it up
+
+    Compilation is lazy, so a few dummy forward passes are run here to
+    trigger it at startup instead of on the first real request. Besides
+    batch size 1, a larger batch is run with its batch dimension marked
+    dynamic, so batched requests reuse one dynamic-shape graph rather
+    than recompiling under load.
+
+    Args:
+        model: Model in evaluation mode
+        mode: torch.compile mode, only used by the Inductor backend
+        backend: torch.compile backend ("ipex" for ipex.optimize'd models)
+
+    Returns:
+        Compiled model, or the original eager model if compilation fails
+    """
+    try:
+        if backend != "inductor":
+            mode = None
+        compiled = torch.compile(model, mode=mode, backend=backend, fullgraph=True)
+
+        with torch.inference_mode(), autocast_context():
+            for batch_size in (1, max(2, warmup_batch_sizes()[-1])):
+                dummy = prepare_input(torch.zeros(batch_size, 3, Config.IMG_SIZE, Config.IMG_SIZE))
+                if batch_size > 1:
+                    torch._dynamo.mark_dynamic(dummy, 0)
+                for _ in range(Config.WARMUP_ITERS):
+                    compiled(dummy)
+
+        logger.info(f"Model compiled with torch.compile (backend={backend}, mode={mode})")
+        return compiled
+
+    except Exception as e:
+        logger.warning(f"torch.compile unavailable, falling back to eager mode: {e}")
+        return model
+
+
+def run_inference(input_batch: torch.Tensor, top_k: int) -> List[List[Dict[str, float]]]:
+    """
+    Run the model on a preprocessed batch
+
+    Args:
+        input_batch: Preprocessed tensor of shape (N, 3, H, W)
+        top_k: Number of top predictions to return per image
+
+    Returns:
+        Top-k predictions for each image in the batch
+    """
+    input_batch = prepare_input(input_batch)
+
+    with torch.inference_mode(), autocast_context():
+        outputs = model(input_batch).float()
+
+        # Select top-k on raw logits; softmax is monotonic so the order is the same
+        k = min(top_k, len(labels_list))
+        if k == 1:
+            top_logits, top_indices = outputs.max(dim=1, keepdim=True)
+        else:
+            top_logits, top_indices = torch.topk(outputs, k)
+
+        # Softmax of only the selected logits, normalized by the full denominator
+        top_probs = torch.exp(top_logits - torch.logsumexp(outputs, dim=1, keepdim=True))
+
+    # Single device-to-host transfer per tensor instead of one .item() per element
+    probs_cpu = top_probs.tolist()
+    indices_cpu = top_indices.tolist()
+
+    # Format predictions
+    return [
+        [
+            {"label": labels_list[idx], "confidence": prob}
+            for prob, idx in zip(row_probs, row_indices)
+        ]
+        for row_probs, row_indices in zip(probs_cpu, indices_cpu)
+    ]
+
+
 def predict(image_path: str, top_k: int = 3) -> List[Dict[str, float]]:
     """
     Run inference on an image
@@ -152,61 +467,191 @@ def predict(image_path: str, top_k: int = 3) -> List[Dict[str, float]]:
     Returns:
         List of top-k predictions with labels and confidence scores
     """
-    global model, labels_map, preprocessor
+    global model, labels_list, preprocessor
 
-    if model is None or labels_map is None or preprocessor is None:
+    if model is None or labels_list is None or preprocessor is None:
         raise RuntimeError("Model not loaded. Service not initialized properly.")
 
     try:
-        # Preprocess image
         input_tensor = preprocessor.preprocess_from_path(image_path)
-        input_tensor = input_tensor.to(Config.DEVICE)
+        return inference_executor.submit(run_inference, input_tensor, top_k).result()[0]
 
-        # Run inference
-        with torch.no_grad():
-            outputs = model(input_tensor)
-            probabilities = torch.nn.functional.softmax(outputs, dim=1)
+    except FileNotFoundError as e:
+        logger.error(f"Image file not found: {image_path}")
+        raise HTTPException(status_code=404, detail=f"Image file not found: {image_path}")
+    except Exception as e:
+        logger.error(f"Error during inference: {e}")
+        raise HTTPException(status_code=500, detail=f"Inference error: {str(e)}")
 
-        # Get top-k predictions
-        top_probs, top_indices = torch.topk(probabilities, min(top_k, len(labels_map)))
 
-        # Format predictions
-        predictions = []
-        for prob, idx in zip(top_probs[0], top_indices[0]):
-            predictions.append({
-                "label": labels_map[idx.item()],
-                "confidence": round(prob.item(), 4)
-            })
+def predict_batch(image_paths: List[str], top_k: int = 3) -> List[List[Dict[str, float]]]:
+    """
+    Run inference on several images in a single forward pass
 
-        return predictions
+    Args:
+        image_paths: Paths to input images
+        top_k: Number of top predictions to return per image
+
+    Returns:
+        Top-k predictions for each image, in request order
+    """
+    global model, labels_list, preprocessor
+
+    if model is None or labels_list is None or preprocessor is None:
+        raise RuntimeError("Model not loaded. Service not initialized properly.")
+
+    try:
+        tensors = list(preprocess_executor.map(preprocessor.preprocess_from_path, image_paths))
+        return inference_executor.submit(run_inference, torch.cat(tensors), top_k).result()
 
     except FileNotFoundError as e:
-        logger.error(f"Image file not found: {image_path}")
-        raise HTTPException(status_code=404, detail=f"Image file not found: {image_path}")
+        logger.error(str(e))
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        logger.error(f"Error during inference: {e}")
+        logger.error(f"Error during batch inference: {e}")
         raise HTTPException(status_code=500, detail=f"Inference error: {str(e)}")
 
 
+class DynamicBatcher:
+    """Groups concurrent single-image requests into batched forward passes"""
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        """
+        Args:
+            max_batch_size: Maximum number of images per forward pass
+            max_wait_ms: How long to wait for more requests once one arrives
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        """Start the background batching task on the running event loop"""
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background batching task"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, image_path: str) -> List[Dict[str, float]]:
+        """
+        Preprocess an image and queue it for the next batch
+
+        Args:
+            image_path: Path to input image
+
+        Returns:
+            List of top-k predictions with labels and confidence scores
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            input_tensor = await loop.run_in_executor(
+                preprocess_executor, preprocessor.preprocess_from_path, image_path
+            )
+            future = loop.create_future()
+            await self.queue.put((input_tensor, future))
+            return await future
+
+        except FileNotFoundError as e:
+            logger.error(f"Image file not found: {image_path}")
+            raise HTTPException(status_code=404, detail=f"Image file not found: {image_path}")
+        except Exception as e:
+            logger.error(f"Error during inference: {e}")
+            raise HTTPException(status_code=500, detail=f"Inference error: {str(e)}")
+
+    async def _collect_batch(self):
+        """Wait for one request, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Drain the queue forever, running one forward pass per batch"""
+        while True:
+            batch = await self._collect_batch()
+            tensors, futures = zip(*batch)
+
+            try:
+                # Run the model off the event loop so new requests keep queueing
+                results = await asyncio.get_running_loop().run_in_executor(
+                    inference_executor, run_inference, torch.cat(tensors), Config.TOP_K
+                )
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for future, predictions in zip(futures, results):
+                # Skip requests whose client has gone away
+                if not future.done():
+                    future.set_result(predictions)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
-    global model, labels_map, preprocessor
+    global model, labels_list, preprocessor, batcher, autocast_dtype, input_dtype
 
     # Startup
     logger.info("Starting ML inference service...")
     logger.info(f"Using device: {Config.DEVICE}")
 
     try:
-        # Load labels
-        labels_map = load_labels(Config.LABELS_PATH)
-        num_classes = len(labels_map)
-
-        # Load model
-        model = load_model(Config.MODEL_PATH, num_classes, Config.DEVICE)
+        # Load model, using the labels stored with it when available
+        model, labels_list = load_model(Config.MODEL_PATH, Config.DEVICE)
+        if labels_list is None:
+            labels_list = load_labels(Config.LABELS_PATH)
+        logger.info(f"Serving {len(labels_list)} classes")
+        if Config.DEVICE.type == "cpu" and not Config.QUANTIZED:
+            model = optimize_for_cpu(model)
+            if ipex is not None and Config.CPU_BF16:
+                autocast_dtype = torch.bfloat16
+        elif Config.DEVICE.type == "cuda" and Config.CUDA_FP16:
+            model = model.half()
+            autocast_dtype = input_dtype = torch.float16
+        use_cuda_graph = Config.CUDA_GRAPHS and Config.DEVICE.type == "cuda"
+        if Config.COMPILE_MODEL and not Config.QUANTIZED:
+            # reduce-overhead captures its own CUDA graphs; don't nest them in ours
+            mode = Config.COMPILE_MODE
+            if use_cuda_graph and mode == "reduce-overhead":
+                mode = "default"
+            # IPEX's fused modules only trace under its own backend
+            use_ipex = ipex is not None and Config.DEVICE.type == "cpu"
+            model = inference_executor.submit(
+                compile_model, model, mode, "ipex" if use_ipex else "inductor"
+            ).result()
+        if use_cuda_graph:
+            model = inference_executor.submit(capture_cuda_graph, model, Config.DEVICE).result()
 
         # Initialize preprocessor
-        preprocessor = ImagePreprocessor(img_size=Config.IMG_SIZE)
+        preprocessor = ImagePreprocessor(
+            img_size=Config.IMG_SIZE,
+            device=Config.DEVICE,
+            cache_size=Config.PREPROCESS_CACHE_SIZE
+        )
+
+        if Config.DYNAMIC_BATCHING:
+            batcher = DynamicBatcher(Config.DYNAMIC_BATCH_SIZE, Config.BATCH_WAIT_MS)
+            batcher.start()
 
         logger.info("Service initialized successfully!")
 
@@ -218,6 +663,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down ML inference service...")
+    if batcher is not None:
+        await batcher.stop()
 
 
 # Initialize FastAPI app
@@ -225,6 +672,7 @@ app = FastAPI(
     title="Succulent Identifier ML Service",
     description="Image classification service for succulent plant identification",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -255,8 +703,8 @@ async def health():
     return {
         "status": "healthy",
         "model_loaded": model is not None,
-        "labels_loaded": labels_map is not None,
-        "num_classes": len(labels_map) if labels_map else 0,
+        "labels_loaded": labels_list is not None,
+        "num_classes": len(labels_list) if labels_list else 0,
         "device": str(Config.DEVICE)
     }
 
@@ -275,7 +723,10 @@ async def infer(request: InferenceRequest):
     logger.info(f"Inference request for image: {request.image_path}")
 
     try:
-        predictions = predict(request.image_path, top_k=Config.TOP_K)
+        if batcher is not None:
+            predictions = await batcher.predict(request.image_path)
+        else:
+            predictions = predict(request.image_path, top_k=Config.TOP_K)
         logger.info(f"Inference completed. Top prediction: {predictions[0]['label']} "
                    f"(confidence: {predictions[0]['confidence']:.2%})")
 
@@ -288,6 +739,44 @@ async def infer(request: InferenceRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/infer_batch", response_model=BatchInferenceResponse)
+async def infer_batch(request: BatchInferenceRequest):
+    """
+    Run inference on multiple images in one batch
+
+    Args:
+        request: BatchInferenceRequest with image_paths
+
+    Returns:
+        BatchInferenceResponse with top-k predictions per image
+    """
+    num_images = len(request.image_paths)
+    logger.info(f"Batch inference request for {num_images} images")
+
+    if num_images == 0:
+        raise HTTPException(status_code=400, detail="image_paths must not be empty")
+    if num_images > Config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size {num_images} exceeds maximum of {Config.MAX_BATCH_SIZE}"
+        )
+
+    try:
+        # Preprocessing and the forward pass block, so keep them off the event loop
+        results = await asyncio.to_thread(predict_batch, request.image_paths, Config.TOP_K)
+        logger.info(f"Batch inference completed for {num_images} images")
+
+        return BatchInferenceResponse(
+            results=[InferenceResponse(predictions=p) for p in results]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,18 @@
+"""
+Label helpers shared by training and inference
+"""
+
+
+def class_to_label(class_name):
+    """
+    Convert a dataset folder name to a label
+
+    Args:
+        class_name: Folder name, e.g. "cryptanthus-cryptanthus_bivittatus"
+
+    Returns:
+        Label with the genus prefix removed, e.g. "cryptanthus_bivittatus"
+    """
+    if '-' in class_name:
+        return class_name.split('-')[1]
+    return class_name
@@ -2,26 +2,50 @@
 Image preprocessing utilities for inference
 """
 
+import os
+import threading
+from collections import OrderedDict
 from PIL import Image
 import torch
-from torchvision import transforms
+from torchvision.io import read_image, read_file, decode_image, decode_jpeg, ImageReadMode
+from torchvision.transforms import v2
+from torchvision.transforms.v2.functional import pil_to_tensor
+
+
+# JPEG start-of-image marker
+JPEG_MAGIC = [0xFF, 0xD8]
+
+# Largest image staged through the per-thread pinned buffer (~2.8 MP RGB);
+# bigger images take a plain copy so each thread's buffer stays bounded
+MAX_STAGING_BYTES = 8 * 1024 * 1024
 
 
 class ImagePreprocessor:
     """Handles image preprocessing for model inference"""
 
-    def __init__(self, img_size=224):
+    def __init__(self, img_size=224, device=None, cache_size=0):
         """
         Initialize preprocessor with image transformations
 
         Args:
             img_size: Target image size for model input
+            device: Device to decode and transform images on (default: CPU)
+            cache_size: Number of preprocessed images to keep in an LRU
+                cache keyed by path and modification time (0 disables it).
+                Entries are kept in host memory, not on the device
         """
         self.img_size = img_size
-        self.transform = transforms.Compose([
-            transforms.Resize((img_size, img_size)),
-            transforms.ToTensor(),
-            transforms.Normalize(
+        self.device = torch.device(device or "cpu")
+        # Per-thread pinned staging buffers for host-to-device copies
+        self._local = threading.local()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Resize runs on uint8 before converting to float
+        self.transform = v2.Compose([
+            v2.Resize((img_size, img_size), antialias=True),
+            v2.ToDtype(torch.float32, scale=True),
+            v2.Normalize(
                 mean=[0.485, 0.456, 0.406],
                 std=[0.229, 0.224, 0.225]
             )
@@ -31,42 +55,88 @@ class ImagePreprocessor:
         """
         Load image from file path
 
+        On CUDA devices, JPEGs are decoded on the GPU with nvJPEG so only
+        the compressed bytes cross PCIe; other formats are decoded on CPU
+        and then moved to the device. On CPU, JPEGs are decoded at a
+        reduced scale via libjpeg's DCT scaling, never below twice the
+        target size.
+
         Args:
             image_path: Path to image file
 
         Returns:
-            PIL Image object
+            uint8 RGB tensor of shape (3, H, W) on the preprocessor device
 
         Raises:
             FileNotFoundError: If image file doesn't exist
             IOError: If image cannot be opened
         """
+        if not os.path.isfile(image_path):
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+
         try:
-            image = Image.open(image_path)
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            return image
+            if self.device.type != "cuda":
+                with Image.open(image_path) as image:
+                    # Phone photos with embedded previews are reported as MPO
+                    if image.format in ("JPEG", "MPO"):
+                        image.draft("RGB", (self.img_size * 2, self.img_size * 2))
+                        return pil_to_tensor(image.convert("RGB"))
+                return read_image(image_path, mode=ImageReadMode.RGB)
+
+            data = read_file(image_path)
+            if data[:2].tolist() == JPEG_MAGIC:
+                return decode_jpeg(data, mode=ImageReadMode.RGB, device=self.device)
+            return self._to_device(decode_image(data, mode=ImageReadMode.RGB))
         except FileNotFoundError:
             raise FileNotFoundError(f"Image file not found: {image_path}")
         except Exception as e:
             raise IOError(f"Error loading image {image_path}: {str(e)}")
 
+    def _to_device(self, image):
+        """
+        Copy a CPU tensor to the device through a reusable pinned buffer
+
+        Pinned memory lets the copy run asynchronously instead of being
+        staged through pageable memory on every call. Images larger than
+        MAX_STAGING_BYTES are copied directly so the buffer stays small.
+
+        Args:
+            image: Contiguous CPU tensor
+
+        Returns:
+            Tensor on the preprocessor device
+        """
+        if image.numel() * image.element_size() > MAX_STAGING_BYTES:
+            return image.to(self.device)
+
+        staging = getattr(self._local, "staging", None)
+        if staging is None or staging.numel() < image.numel() or staging.dtype != image.dtype:
+            staging = torch.empty(image.numel(), dtype=image.dtype, pin_memory=True)
+            self._local.staging = staging
+        elif self._local.copy_done is not None:
+            # The previous copy out of this buffer must finish before overwriting it
+            self._local.copy_done.synchronize()
+
+        host = staging[:image.numel()].view(image.shape)
+        host.copy_(image)
+        tensor = host.to(self.device, non_blocking=True)
+
+        self._local.copy_done = torch.cuda.Event()
+        self._local.copy_done.record()
+        return tensor
+
     def preprocess(self, image):
         """
         Preprocess image for model inference
 
         Args:
-            image: PIL Image object
+            image: uint8 RGB tensor of shape (3, H, W)
 
         Returns:
             Preprocessed tensor with batch dimension
         """
-        # Apply transformations
-        tensor = self.transform(image)
-        # Add batch dimension
-        tensor = tensor.unsqueeze(0)
-        return tensor
+        # Apply transformations and add batch dimension
+        return self.transform(image).unsqueeze_(0)
 
     def preprocess_from_path(self, image_path):
         """
@@ -78,8 +148,71 @@ class ImagePreprocessor:
         Returns:
             Preprocessed tensor with batch dimension
         """
-        image = self.load_image(image_path)
-        return self.preprocess(image)
+        if not self.cache_size:
+            return self.preprocess(self.load_image(image_path))
+
+        try:
+            mtime = os.path.getmtime(image_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+
+        # mtime is part of the key so edited files are reloaded
+        key = (image_path, mtime)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+
+        if entry is not None:
+            return self._from_cache(entry)
+
+        tensor = self.preprocess(self.load_image(image_path))
+        self._store_in_cache(key, tensor)
+        return tensor
+
+    def _store_in_cache(self, key, tensor):
+        """
+        Store a host copy of a freshly preprocessed tensor
+
+        On CUDA the copy goes into pinned memory asynchronously, so the
+        caller keeps using the device tensor without waiting on it.
+
+        Args:
+            key: Cache key of (path, mtime)
+            tensor: Preprocessed tensor on the preprocessor device
+        """
+        if self.device.type == "cpu":
+            entry = (tensor.clone(), None)
+        else:
+            host = torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=True)
+            host.copy_(tensor, non_blocking=True)
+            copy_done = torch.cuda.Event()
+            copy_done.record()
+            entry = (host, copy_done)
+
+        with self._cache_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _from_cache(self, entry):
+        """
+        Return a private copy of a cached tensor on the preprocessor device
+
+        Args:
+            entry: Tuple of host tensor and the event marking its copy done
+
+        Returns:
+            Preprocessed tensor with batch dimension
+        """
+        host, copy_done = entry
+        if copy_done is None:
+            return host.clone()
+
+        # Order the upload after the pending download without blocking the host
+        torch.cuda.current_stream(self.device).wait_event(copy_done)
+        return host.to(self.device, non_blocking=True)
 
 
 def validate_image_file(file_path):
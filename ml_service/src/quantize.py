@@ -0,0 +1,105 @@
+"""
+Post-training INT8 quantization of the succulent classifier
+"""
+
+import os
+import json
+import torch
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+from pathlib import Path
+
+from architecture import build_model
+from preprocessing import ImagePreprocessor
+
+
+# Configuration
+class Config:
+    DATA_DIR = "../data/raw"
+    MODEL_PATH = "../models/succulent_classifier_best.pth"
+    OUTPUT_PATH = "../models/succulent_int8.pt"
+
+    # Calibration parameters
+    NUM_CALIBRATION_IMAGES = 100
+    IMG_SIZE = 224
+
+    # Quantized kernels backend (x86 CPUs)
+    BACKEND = "fbgemm"
+
+    IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+def load_float_model(model_path):
+    """Load the trained FP32 model and its class names on CPU"""
+    checkpoint = torch.load(model_path, map_location="cpu")
+    classes = checkpoint['classes']
+    model = build_model(len(classes))
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+
+    print(f"Loaded FP32 model from {model_path}")
+    return model, classes
+
+
+def get_calibration_images(data_dir, num_images):
+    """Collect calibration image paths, spread across all classes"""
+    class_dirs = sorted(d for d in Path(data_dir).iterdir() if d.is_dir())
+    per_class = max(1, num_images // max(1, len(class_dirs)))
+
+    image_paths = []
+    for class_dir in class_dirs:
+        files = sorted(
+            f for f in class_dir.iterdir()
+            if f.suffix.lower() in Config.IMAGE_EXTENSIONS
+        )
+        image_paths.extend(files[:per_class])
+
+    return image_paths[:num_images]
+
+
+def quantize_model(model, image_paths):
+    """Quantize model to INT8 using calibration images"""
+    torch.backends.quantized.engine = Config.BACKEND
+    preprocessor = ImagePreprocessor(img_size=Config.IMG_SIZE)
+    example_input = torch.zeros(1, 3, Config.IMG_SIZE, Config.IMG_SIZE)
+
+    # Graph mode fuses conv-bn(-relu) and inserts observers
+    qconfig_mapping = get_default_qconfig_mapping(Config.BACKEND)
+    prepared = prepare_fx(model, qconfig_mapping, example_inputs=(example_input,))
+
+    # Calibrate activation ranges
+    with torch.inference_mode():
+        for image_path in image_paths:
+            prepared(preprocessor.preprocess_from_path(str(image_path)))
+
+    print(f"Calibrated on {len(image_paths)} images")
+    return convert_fx(prepared), example_input
+
+
+def save_quantized_model(model, example_input, classes, save_path):
+    """Save quantized model as frozen TorchScript, with class names embedded"""
+    with torch.inference_mode():
+        scripted = torch.jit.freeze(torch.jit.trace(model, example_input).eval())
+    torch.jit.save(scripted, save_path, _extra_files={"classes.json": json.dumps(classes)})
+
+    size_mb = os.path.getsize(save_path) / (1024 * 1024)
+    print(f"Quantized model saved to {save_path} ({size_mb:.1f} MB)")
+
+
+def main():
+    """Main quantization function"""
+    model, classes = load_float_model(Config.MODEL_PATH)
+
+    image_paths = get_calibration_images(Config.DATA_DIR, Config.NUM_CALIBRATION_IMAGES)
+    if not image_paths:
+        raise RuntimeError(f"No calibration images found in {Config.DATA_DIR}")
+
+    print("\nQuantizing model...")
+    quantized, example_input = quantize_model(model, image_paths)
+    save_quantized_model(quantized, example_input, classes, Config.OUTPUT_PATH)
+
+    print("\nQuantization completed!")
+
+
+if __name__ == "__main__":
+    main()
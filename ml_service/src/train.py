@@ -7,12 +7,14 @@ import json
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, random_split
+from torch.utils.data import DataLoader, Subset, TensorDataset, random_split
 from torchvision import datasets, transforms, models
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from labels import class_to_label
+
 
 # Configuration
 class Config:
@@ -21,17 +23,29 @@ class Config:
     LABELS_PATH = "../labels.json"
 
     # Training hyperparameters
-    BATCH_SIZE = 16
+    BATCH_SIZE = 64
     NUM_EPOCHS = 25
     LEARNING_RATE = 0.001
     TRAIN_SPLIT = 0.8
 
+    # Data loading
+    NUM_WORKERS = 8
+    PREFETCH_FACTOR = 4
+
     # Image parameters
     IMG_SIZE = 224
 
     # Device
     DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+    # Mixed precision and compilation
+    USE_AMP = DEVICE.type == "cuda"
+    # Only used when PRECOMPUTE_FEATURES is False; the head alone isn't worth compiling
+    COMPILE_MODEL = True
+
+    # Backbone is frozen, so its features can be computed once up front
+    PRECOMPUTE_FEATURES = True
+
 
 def get_data_transforms():
     """Define data augmentation and normalization transforms"""
@@ -55,37 +69,42 @@ def get_data_transforms():
 
 def prepare_data(train_transforms, val_transforms):
     """Load and split dataset"""
-    # Load full dataset with training transforms first
-    full_dataset = datasets.ImageFolder(root=Config.DATA_DIR)
+    # Separate dataset instances so train and validation keep their own transforms
+    full_dataset = datasets.ImageFolder(root=Config.DATA_DIR, transform=train_transforms)
+    val_full_dataset = datasets.ImageFolder(root=Config.DATA_DIR, transform=val_transforms)
 
     # Calculate split sizes
     train_size = int(Config.TRAIN_SPLIT * len(full_dataset))
     val_size = len(full_dataset) - train_size
 
-    # Split dataset
-    train_dataset, val_dataset = random_split(
-        full_dataset,
+    # Split indices once and apply them to both instances
+    train_split, val_split = random_split(
+        range(len(full_dataset)),
         [train_size, val_size],
         generator=torch.Generator().manual_seed(42)
     )
-
-    # Apply transforms
-    train_dataset.dataset.transform = train_transforms
-    val_dataset.dataset.transform = val_transforms
+    train_dataset = Subset(full_dataset, train_split.indices)
+    val_dataset = Subset(val_full_dataset, val_split.indices)
 
     # Create data loaders
     train_loader = DataLoader(
         train_dataset,
         batch_size=Config.BATCH_SIZE,
         shuffle=True,
-        num_workers=4
+        num_workers=Config.NUM_WORKERS,
+        persistent_workers=True,
+        pin_memory=Config.DEVICE.type == "cuda",
+        prefetch_factor=Config.PREFETCH_FACTOR
     )
 
     val_loader = DataLoader(
         val_dataset,
         batch_size=Config.BATCH_SIZE,
         shuffle=False,
-        num_workers=4
+        num_workers=Config.NUM_WORKERS,
+        persistent_workers=True,
+        pin_memory=Config.DEVICE.type == "cuda",
+        prefetch_factor=Config.PREFETCH_FACTOR
     )
 
     return train_loader, val_loader, full_dataset.classes
@@ -110,7 +129,31 @@ def build_model(num_classes):
     return model.to(Config.DEVICE)
 
 
-def train_epoch(model, train_loader, criterion, optimizer):
+def extract_features(model, data_loader, shuffle):
+    """Run the frozen backbone once over a dataset and return a loader of pooled features"""
+    model.eval()
+    features = []
+    targets = []
+
+    # no_grad rather than inference_mode: the classifier later needs these for backward
+    with torch.no_grad():
+        for inputs, labels in tqdm(data_loader, desc="Extracting features"):
+            inputs = inputs.to(Config.DEVICE, non_blocking=True)
+            with torch.autocast(Config.DEVICE.type, dtype=torch.float16, enabled=Config.USE_AMP):
+                feats = torch.flatten(model.avgpool(model.features(inputs)), 1)
+            features.append(feats.float().cpu())
+            targets.append(labels)
+
+    dataset = TensorDataset(torch.cat(features), torch.cat(targets))
+    return DataLoader(
+        dataset,
+        batch_size=Config.BATCH_SIZE,
+        shuffle=shuffle,
+        pin_memory=Config.DEVICE.type == "cuda"
+    )
+
+
+def train_epoch(model, train_loader, criterion, optimizer, scaler):
     """Train for one epoch"""
     model.train()
     running_loss = 0.0
@@ -119,18 +162,21 @@ def train_epoch(model, train_loader, criterion, optimizer):
 
     pbar = tqdm(train_loader, desc="Training")
     for inputs, labels in pbar:
-        inputs, labels = inputs.to(Config.DEVICE), labels.to(Config.DEVICE)
+        inputs = inputs.to(Config.DEVICE, non_blocking=True)
+        labels = labels.to(Config.DEVICE, non_blocking=True)
 
         # Zero gradients
         optimizer.zero_grad()
 
         # Forward pass
-        outputs = model(inputs)
-        loss = criterion(outputs, labels)
+        with torch.autocast(Config.DEVICE.type, dtype=torch.float16, enabled=Config.USE_AMP):
+            outputs = model(inputs)
+            loss = criterion(outputs, labels)
 
         # Backward pass
-        loss.backward()
-        optimizer.step()
+        scaler.scale(loss).backward()
+        scaler.step(optimizer)
+        scaler.update()
 
         # Statistics
         running_loss += loss.item()
@@ -159,11 +205,13 @@ def validate_epoch(model, val_loader, criterion):
     with torch.no_grad():
         pbar = tqdm(val_loader, desc="Validation")
         for inputs, labels in pbar:
-            inputs, labels = inputs.to(Config.DEVICE), labels.to(Config.DEVICE)
+            inputs = inputs.to(Config.DEVICE, non_blocking=True)
+            labels = labels.to(Config.DEVICE, non_blocking=True)
 
             # Forward pass
-            outputs = model(inputs)
-            loss = criterion(outputs, labels)
+            with torch.autocast(Config.DEVICE.type, dtype=torch.float16, enabled=Config.USE_AMP):
+                outputs = model(inputs)
+                loss = criterion(outputs, labels)
 
             # Statistics
             running_loss += loss.item()
@@ -212,17 +260,9 @@ def plot_training_history(history, save_path):
 def save_labels_mapping(classes, save_path):
     """Save class index to label mapping"""
     # Convert folder names to proper format: genus_species
-    labels_map = {}
-    for idx, class_name in enumerate(classes):
-        # Remove genus prefix if present in folder name
-        # e.g., "cryptanthus-cryptanthus_bivittatus" -> "cryptanthus_bivittatus"
-        if '-' in class_name:
-            parts = class_name.split('-')
-            label = parts[1]  # Take the second part
-        else:
-            label = class_name
-
-        labels_map[str(idx)] = label
+    labels_map = {
+        str(idx): class_to_label(class_name) for idx, class_name in enumerate(classes)
+    }
 
     with open(save_path, 'w') as f:
         json.dump(labels_map, f, indent=2)
@@ -235,6 +275,9 @@ def main():
     print(f"Using device: {Config.DEVICE}")
     print(f"Training on data from: {Config.DATA_DIR}")
 
+    # Input shape is fixed, so let cuDNN autotune conv algorithms
+    torch.backends.cudnn.benchmark = True
+
     # Create model directory if it doesn't exist
     os.makedirs(Config.MODEL_DIR, exist_ok=True)
 
@@ -253,12 +296,26 @@ def main():
     num_classes = len(classes)
     model = build_model(num_classes)
 
+    if Config.PRECOMPUTE_FEATURES:
+        # Augmentation would change features every epoch, so extract from the plain view
+        print("\nPrecomputing backbone features...")
+        train_loader.dataset.dataset.transform = val_transforms
+        train_loader = extract_features(model, train_loader, shuffle=True)
+        val_loader = extract_features(model, val_loader, shuffle=False)
+
+        # Only the classifier head is trained; it is still part of model for checkpoints
+        train_model = model.classifier
+    else:
+        # Compiled wrapper shares parameters with model; checkpoints save model itself
+        train_model = torch.compile(model) if Config.COMPILE_MODEL else model
+
     # Loss and optimizer
     criterion = nn.CrossEntropyLoss()
     optimizer = optim.Adam(model.classifier.parameters(), lr=Config.LEARNING_RATE)
     scheduler = optim.lr_scheduler.ReduceLROnPlateau(
         optimizer, mode='min', patience=3, factor=0.5
     )
+    scaler = torch.amp.GradScaler(Config.DEVICE.type, enabled=Config.USE_AMP)
 
     # Training loop
     print(f"\nStarting training for {Config.NUM_EPOCHS} epochs...")
@@ -276,10 +333,10 @@ def main():
         print("-" * 50)
 
         # Train
-        train_loss, train_acc = train_epoch(model, train_loader, criterion, optimizer)
+        train_loss, train_acc = train_epoch(train_model, train_loader, criterion, optimizer, scaler)
 
         # Validate
-        val_loss, val_acc = validate_epoch(model, val_loader, criterion)
+        val_loss, val_acc = validate_epoch(train_model, val_loader, criterion)
 
         # Update learning rate
         scheduler.step(val_loss)